@@ -1,16 +1,87 @@
 from flask import Flask, render_template, request, jsonify, send_file
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, date
+from dataclasses import dataclass
+from typing import Optional
 import os
-import json
+import io
+import math
+import threading
 from data_processor import NASADataProcessor
-import tempfile
 
 app = Flask(__name__)
 
-# Initialize the data processor
-data_processor = NASADataProcessor()
+_processor = None
+_processor_lock = threading.Lock()
+
+def get_processor():
+    """Initialize the data processor once per worker process, on first use"""
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            # Re-check so concurrent first requests build only one processor
+            if _processor is None:
+                _processor = NASADataProcessor()
+    return _processor
+
+@dataclass(slots=True)
+class LocDate:
+    """Validated location (and optional date) from an API request"""
+    lat: float
+    lng: float
+    target_date: Optional[date] = None
+
+def _to_coordinate(value):
+    """Convert a JSON latitude/longitude to float, or None if it is invalid"""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        value = float(value)
+    except (ValueError, OverflowError):
+        return None
+    return value if math.isfinite(value) else None
+
+def _to_date(value):
+    """Parse a strict YYYY-MM-DD string, or return None if it is invalid"""
+    if not isinstance(value, str) or len(value) != 10 or value.count('-') != 2:
+        return None
+    try:
+        parsed = date.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.isoformat() == value else None
+
+def _error(message):
+    return jsonify({'success': False, 'error': message}), 400
+
+def parse_request(data, require_date=True):
+    """Validate request JSON and return (LocDate, None) or (None, error_response)"""
+    if not data or not isinstance(data, dict):
+        return None, _error('No JSON data provided')
+    
+    lat = data.get('latitude')
+    lng = data.get('longitude')
+    target_date = data.get('date')
+    
+    if lat is None or lng is None or (require_date and not target_date):
+        if require_date:
+            return None, _error('Missing required parameters: latitude, longitude, and date are required')
+        return None, _error('Missing required parameters: latitude and longitude are required')
+    
+    # Convert to appropriate types
+    lat = _to_coordinate(lat)
+    lng = _to_coordinate(lng)
+    if lat is None or lng is None:
+        return None, _error('Invalid latitude or longitude format')
+    
+    # Validate date and parse it once for downstream use
+    if require_date:
+        target_date = _to_date(target_date)
+        if target_date is None:
+            return None, _error('Invalid date format. Use YYYY-MM-DD')
+    else:
+        target_date = None
+    
+    return LocDate(lat, lng, target_date), None
 
 @app.route('/')
 def index():
@@ -20,50 +91,20 @@ def index():
 @app.route('/api/weather-probability', methods=['POST'])
 def get_weather_probability():
     """API endpoint to get weather probabilities for a location and date"""
+    loc, error = parse_request(request.get_json(silent=True))
+    if error:
+        return error
+    lat, lng, target_date = loc.lat, loc.lng, loc.target_date
+    
     try:
-        data = request.get_json()
-        
-        # Validate required parameters
-        if not data:
-            return jsonify({'success': False, 'error': 'No JSON data provided'}), 400
-        
-        lat = data.get('latitude')
-        lng = data.get('longitude')
-        target_date = data.get('date')
-        
-        if lat is None or lng is None or not target_date:
-            return jsonify({
-                'success': False, 
-                'error': 'Missing required parameters: latitude, longitude, and date are required'
-            }), 400
-        
-        # Convert to appropriate types
-        try:
-            lat = float(lat)
-            lng = float(lng)
-        except (ValueError, TypeError):
-            return jsonify({
-                'success': False, 
-                'error': 'Invalid latitude or longitude format'
-            }), 400
-        
-        # Validate date
-        try:
-            datetime.strptime(target_date, '%Y-%m-%d')
-        except ValueError:
-            return jsonify({
-                'success': False, 
-                'error': 'Invalid date format. Use YYYY-MM-DD'
-            }), 400
-        
         # Calculate probabilities
-        probabilities = data_processor.calculate_probabilities(lat, lng, target_date)
+        probabilities = get_processor().calculate_probabilities(lat, lng, target_date)
         
         return jsonify({
             'success': True,
             'probabilities': probabilities,
             'location': f"{lat:.4f}, {lng:.4f}",
-            'date': target_date,
+            'date': target_date.isoformat(),
             'timestamp': datetime.now().isoformat()
         })
         
@@ -77,33 +118,14 @@ def get_weather_probability():
 @app.route('/api/historical-trends', methods=['POST'])
 def get_historical_trends():
     """API endpoint to get historical weather trends for a location"""
+    loc, error = parse_request(request.get_json(silent=True), require_date=False)
+    if error:
+        return error
+    lat, lng = loc.lat, loc.lng
+    
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'success': False, 'error': 'No JSON data provided'}), 400
-        
-        lat = data.get('latitude')
-        lng = data.get('longitude')
-        
-        if lat is None or lng is None:
-            return jsonify({
-                'success': False, 
-                'error': 'Missing required parameters: latitude and longitude are required'
-            }), 400
-        
-        # Convert to appropriate types
-        try:
-            lat = float(lat)
-            lng = float(lng)
-        except (ValueError, TypeError):
-            return jsonify({
-                'success': False, 
-                'error': 'Invalid latitude or longitude format'
-            }), 400
-        
         # Get historical trends
-        trends = data_processor.get_historical_trends(lat, lng)
+        trends = get_processor().get_historical_trends(lat, lng)
         
         return jsonify({
             'success': True,
@@ -122,68 +144,27 @@ def get_historical_trends():
 @app.route('/api/download-data', methods=['POST'])
 def download_data():
     """API endpoint to download weather probability data as CSV"""
+    loc, error = parse_request(request.get_json(silent=True))
+    if error:
+        return error
+    lat, lng, target_date = loc.lat, loc.lng, loc.target_date
+    
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'success': False, 'error': 'No JSON data provided'}), 400
-        
-        lat = data.get('latitude')
-        lng = data.get('longitude')
-        target_date = data.get('date')
-        
-        if lat is None or lng is None or not target_date:
-            return jsonify({
-                'success': False, 
-                'error': 'Missing required parameters: latitude, longitude, and date are required'
-            }), 400
-        
-        # Convert to appropriate types
-        try:
-            lat = float(lat)
-            lng = float(lng)
-        except (ValueError, TypeError):
-            return jsonify({
-                'success': False, 
-                'error': 'Invalid latitude or longitude format'
-            }), 400
-        
-        # Validate date
-        try:
-            datetime.strptime(target_date, '%Y-%m-%d')
-        except ValueError:
-            return jsonify({
-                'success': False, 
-                'error': 'Invalid date format. Use YYYY-MM-DD'
-            }), 400
-        
         # Generate CSV data
-        csv_data = data_processor.generate_csv_data(lat, lng, target_date)
+        csv_data = get_processor().generate_csv_data(lat, lng, target_date)
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            csv_data.to_csv(f.name, index=False)
-            temp_filename = f.name
+        # Encode the CSV text into an in-memory byte buffer
+        buffer = io.BytesIO(csv_data.getvalue().encode('utf-8'))
         
         # Send file
         download_filename = f"weather_probability_{lat:.4f}_{lng:.4f}_{target_date}.csv"
-        response = send_file(
-            temp_filename,
+        return send_file(
+            buffer,
             as_attachment=True,
             download_name=download_filename,
             mimetype='text/csv'
         )
         
-        # Clean up temporary file after send
-        @response.call_on_close
-        def cleanup_temp_file():
-            try:
-                os.unlink(temp_filename)
-            except OSError:
-                pass
-        
-        return response
-        
     except Exception as e:
         app.logger.error(f"Error in download-data endpoint: {str(e)}")
         return jsonify({
@@ -197,7 +178,7 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'data_loaded': data_processor.data_loaded
+        'data_loaded': get_processor().data_loaded
     })
 
 @app.errorhandler(404)
@@ -212,4 +193,5 @@ if __name__ == '__main__':
     print("Starting Weather Probability Dashboard...")
     print("Access the application at: http://localhost:5000")
     print("API Health check: http://localhost:5000/api/health")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    print("For production use a WSGI server, e.g.: gunicorn -w 4 --threads 4 wsgi:app")
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000)
\ No newline at end of file
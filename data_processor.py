@@ -1,15 +1,44 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 import os
 import glob
+import csv
+import io
+
+def _exceedance_percent(sorted_values, threshold, above):
+    """Percentage of sorted values above (or below) threshold via binary search"""
+    count = sorted_values.shape[0]
+    if count == 0:
+        return 0.0
+    if above:
+        # NaNs sort last; like (x > t).mean() they count as days but never as hits
+        valid = np.searchsorted(sorted_values, np.inf, side='right')
+        hits = valid - np.searchsorted(sorted_values, threshold, side='right')
+    else:
+        hits = np.searchsorted(sorted_values, threshold, side='left')
+    return 100.0 * float(hits) / count
+
+# Column layout of the CSV export (metadata, probabilities and trends side by side)
+CSV_COLUMNS = [
+    'Parameter', 'Value', 'Weather Condition', 'Probability (%)', 'Threshold',
+    'Year', 'Hot Day Probability (%)', 'Wet Day Probability (%)'
+]
 
 class NASADataProcessor:
     def __init__(self, data_directory="sample_data"):
         self.data_directory = data_directory
         self.historical_data = {}
         self.data_loaded = False
+        self._doy_windows = {}
+        self._probabilities = []
+        self._trends = None
+        self._csv_cache = {}
+        self._rng = np.random.default_rng(0)
         self.load_nasa_data()
+        self._build_doy_windows()
+        self._build_result_cache()
+        self._build_csv_cache()
     
     def load_nasa_data(self):
         """Load and process NASA data files"""
@@ -117,15 +146,41 @@ class NASADataProcessor:
     
     def _process_generic_data(self, file_path):
         """Process generic data files"""
+        filename = os.path.basename(file_path)
         try:
-            # Try to read as CSV first
+            # NetCDF is binary, so it goes through xarray rather than a CSV reader.
+            # Optional readers are imported here to keep module import cheap
+            if filename.lower().endswith('.nc'):
+                try:
+                    import xarray as xr
+                except ImportError:
+                    print(f"xarray not installed, skipping NetCDF file {filename}")
+                    return
+                with xr.open_dataset(file_path) as ds:
+                    print(f"Loaded NetCDF data from {filename} with variables: {', '.join(ds.data_vars)}")
+                return
+            
+            # Try the multithreaded pyarrow CSV reader first
+            try:
+                from pyarrow import csv as pa_csv
+            except ImportError:
+                pa_csv = None
+            if pa_csv is not None:
+                try:
+                    df = pa_csv.read_csv(file_path).to_pandas()
+                    print(f"Loaded CSV data from {filename} with {len(df)} rows")
+                    return
+                except Exception:
+                    pass
+            
+            # Try to read as CSV with pandas
             try:
                 df = pd.read_csv(file_path)
-                print(f"Loaded CSV data from {os.path.basename(file_path)} with {len(df)} rows")
-            except:
+                print(f"Loaded CSV data from {filename} with {len(df)} rows")
+            except Exception:
                 # Try to read as space-delimited text
-                df = pd.read_csv(file_path, delim_whitespace=True)
-                print(f"Loaded text data from {os.path.basename(file_path)} with {len(df)} rows")
+                df = pd.read_csv(file_path, sep=r'\s+')
+                print(f"Loaded text data from {filename} with {len(df)} rows")
         except Exception as e:
             print(f"Could not process {file_path}: {e}")
     
@@ -137,224 +192,230 @@ class NASADataProcessor:
         start_date = '2008-01-01'
         end_date = '2023-12-31'
         dates = pd.date_range(start=start_date, end=end_date, freq='D')
+        n = len(dates)
+        day_of_year = dates.dayofyear.to_numpy()
         
         # Temperature data with realistic seasonal patterns
-        temp_data = []
-        for date in dates:
-            # Base seasonal pattern (more realistic)
-            day_of_year = date.timetuple().tm_yday
-            base_temp = 50 + 25 * np.sin(2 * np.pi * (day_of_year - 81) / 365)
-            
-            # Add some random variation and slight warming trend
-            year_factor = (date.year - 2008) * 0.05  # Slight warming trend
-            noise = np.random.normal(0, 8)
-            temp = base_temp + noise + year_factor
-            
-            temp_data.append({'date': date, 'temperature': temp})
+        base_temp = 50 + 25 * np.sin(2 * np.pi * (day_of_year - 81) / 365)
+        year_factor = (dates.year.to_numpy() - 2008) * 0.05  # Slight warming trend
+        temp = base_temp + self._rng.normal(0, 8, size=n) + year_factor
         
-        self.historical_data['temperature'] = pd.DataFrame(temp_data)
+        self.historical_data['temperature'] = self._pack_series(dates, day_of_year, temp)
         
-        # Precipitation data
-        precip_data = []
-        for date in dates:
-            day_of_year = date.timetuple().tm_yday
-            
-            # Seasonal precipitation patterns
-            if 60 <= day_of_year <= 150:  # Spring
-                base_precip = np.random.exponential(0.15)
-            elif 151 <= day_of_year <= 240:  # Summer
-                base_precip = np.random.exponential(0.25)
-            elif 241 <= day_of_year <= 330:  # Fall
-                base_precip = np.random.exponential(0.18)
-            else:  # Winter
-                base_precip = np.random.exponential(0.12)
-            
-            # Occasional heavy rainfall events
-            if np.random.random() < 0.02:  # 2% chance of heavy rain
-                base_precip += np.random.exponential(0.5)
-            
-            precip_data.append({'date': date, 'precipitation': base_precip})
+        # Precipitation data with seasonal patterns
+        spring = (day_of_year >= 60) & (day_of_year <= 150)
+        summer = (day_of_year >= 151) & (day_of_year <= 240)
+        fall = (day_of_year >= 241) & (day_of_year <= 330)
+        winter = ~(spring | summer | fall)
         
-        self.historical_data['precipitation'] = pd.DataFrame(precip_data)
+        precip = np.empty(n)
+        precip[spring] = self._rng.exponential(0.15, spring.sum())
+        precip[summer] = self._rng.exponential(0.25, summer.sum())
+        precip[fall] = self._rng.exponential(0.18, fall.sum())
+        precip[winter] = self._rng.exponential(0.12, winter.sum())
         
-        # Wind data
-        wind_data = []
-        for date in dates:
-            day_of_year = date.timetuple().tm_yday
-            
-            # Windier in winter and spring
-            if day_of_year <= 90 or day_of_year >= 300:  # Winter
-                base_wind = np.random.weibull(1.8) * 12
-            elif 91 <= day_of_year <= 180:  # Spring
-                base_wind = np.random.weibull(1.6) * 10
-            else:  # Summer/Fall
-                base_wind = np.random.weibull(1.5) * 8
-            
-            wind_data.append({'date': date, 'wind_speed': base_wind})
+        # Occasional heavy rainfall events (2% chance of heavy rain)
+        precip += self._rng.exponential(0.5, n) * (self._rng.random(n) < 0.02)
         
-        self.historical_data['wind'] = pd.DataFrame(wind_data)
+        self.historical_data['precipitation'] = self._pack_series(dates, day_of_year, precip)
         
-        # Humidity data
-        humidity_data = []
-        for date in dates:
-            day_of_year = date.timetuple().tm_yday
-            
-            # Higher humidity in summer
-            if 150 <= day_of_year <= 240:  # Summer
-                base_humidity = np.random.normal(75, 8)
-            else:
-                base_humidity = np.random.normal(65, 12)
-            
-            base_humidity = max(15, min(95, base_humidity))  # Clamp between 15-95%
-            humidity_data.append({'date': date, 'humidity': base_humidity})
+        # Wind data - windier in winter and spring
+        winter = (day_of_year <= 90) | (day_of_year >= 300)
+        spring = (day_of_year >= 91) & (day_of_year <= 180)
+        summer_fall = ~(winter | spring)
+        
+        wind = np.empty(n)
+        wind[winter] = self._rng.weibull(1.8, winter.sum()) * 12
+        wind[spring] = self._rng.weibull(1.6, spring.sum()) * 10
+        wind[summer_fall] = self._rng.weibull(1.5, summer_fall.sum()) * 8
+        
+        self.historical_data['wind'] = self._pack_series(dates, day_of_year, wind)
+        
+        # Humidity data - higher humidity in summer
+        summer = (day_of_year >= 150) & (day_of_year <= 240)
+        
+        humidity = np.empty(n)
+        humidity[summer] = self._rng.normal(75, 8, summer.sum())
+        humidity[~summer] = self._rng.normal(65, 12, (~summer).sum())
+        humidity = np.clip(humidity, 15, 95)  # Clamp between 15-95%
         
-        self.historical_data['humidity'] = pd.DataFrame(humidity_data)
+        self.historical_data['humidity'] = self._pack_series(dates, day_of_year, humidity)
         
         print("Enhanced sample data generated successfully!")
     
     def _generate_sample_data(self):
         """Legacy sample data generator (simpler version)"""
         dates = pd.date_range(start='2010-01-01', end='2024-12-31', freq='D')
+        n = len(dates)
+        day_of_year = dates.dayofyear.to_numpy()
+        month = dates.month.to_numpy()
         
         # Temperature data
-        temp_data = []
-        for date in dates:
-            base_temp = 50 + 30 * np.sin(2 * np.pi * (date.dayofyear - 81) / 365)
-            noise = np.random.normal(0, 10)
-            temp = base_temp + noise
-            temp_data.append({'date': date, 'temperature': temp})
+        temp = 50 + 30 * np.sin(2 * np.pi * (day_of_year - 81) / 365) + self._rng.normal(0, 10, size=n)
         
-        self.historical_data['temperature'] = pd.DataFrame(temp_data)
+        self.historical_data['temperature'] = self._pack_series(dates, day_of_year, temp)
         
         # Precipitation data
-        precip_data = []
-        for date in dates:
-            if date.month in [3, 4, 5, 6]:
-                precip = np.random.exponential(0.2)
-            else:
-                precip = np.random.exponential(0.05)
-            precip_data.append({'date': date, 'precipitation': precip})
+        wet_season = np.isin(month, [3, 4, 5, 6])
+        precip = np.where(
+            wet_season,
+            self._rng.exponential(0.2, size=n),
+            self._rng.exponential(0.05, size=n)
+        )
         
-        self.historical_data['precipitation'] = pd.DataFrame(precip_data)
+        self.historical_data['precipitation'] = self._pack_series(dates, day_of_year, precip)
         
         # Wind data
-        wind_data = []
-        for date in dates:
-            if date.month in [11, 12, 1, 2]:
-                wind = np.random.weibull(2) * 15
-            else:
-                wind = np.random.weibull(2) * 8
-            wind_data.append({'date': date, 'wind_speed': wind})
+        windy_season = np.isin(month, [11, 12, 1, 2])
+        wind = self._rng.weibull(2, size=n) * np.where(windy_season, 15, 8)
         
-        self.historical_data['wind'] = pd.DataFrame(wind_data)
+        self.historical_data['wind'] = self._pack_series(dates, day_of_year, wind)
         
         # Humidity data
-        humidity_data = []
-        for date in dates:
-            if date.month in [6, 7, 8]:
-                humidity = np.random.normal(75, 10)
+        humid_season = np.isin(month, [6, 7, 8])
+        humidity = np.where(
+            humid_season,
+            self._rng.normal(75, 10, size=n),
+            self._rng.normal(60, 15, size=n)
+        )
+        humidity = np.clip(humidity, 10, 100)
+        
+        self.historical_data['humidity'] = self._pack_series(dates, day_of_year, humidity)
+    
+    @staticmethod
+    def _pack_series(dates, day_of_year, values):
+        """Store a daily series as compact day-of-year / value arrays"""
+        return {
+            'start': dates[0].toordinal(),
+            'doy': np.asarray(day_of_year, dtype=np.int16),
+            'value': np.asarray(values, dtype=np.float32)
+        }
+    
+    def _build_doy_windows(self):
+        """Precompute the +/-7 day window of historical values for every day of year"""
+        series = {
+            param: (arr['doy'], arr['value'])
+            for param, arr in self.historical_data.items()
+        }
+        
+        # Heat index (simplified) needs temperature and humidity on the same daily
+        # axis: same start date and same day-of-year sequence
+        if 'temperature' in series and 'humidity' in series:
+            temp_doy, temp = series['temperature']
+            humidity_doy, humidity = series['humidity']
+            same_start = (self.historical_data['temperature']['start'] ==
+                          self.historical_data['humidity']['start'])
+            if same_start and np.array_equal(temp_doy, humidity_doy):
+                heat_index = (temp + 0.05 * (humidity - 50)).astype(np.float32, copy=False)
+                series['heat_index'] = (temp_doy, heat_index)
             else:
-                humidity = np.random.normal(60, 15)
-            humidity = max(10, min(100, humidity))
-            humidity_data.append({'date': date, 'humidity': humidity})
+                print("Temperature and humidity cover different dates; skipping heat index")
+        
+        self._doy_windows = {}
+        for param, (day_of_year, values) in series.items():
+            # Group values by day of year (index 0 unused, 1-366 valid)
+            order = np.argsort(day_of_year, kind='stable')
+            bounds = np.searchsorted(day_of_year[order], np.arange(1, 368))
+            grouped_values = values[order]
+            by_doy = [grouped_values[:0]] + [
+                grouped_values[bounds[i]:bounds[i + 1]] for i in range(366)
+            ]
+            
+            # Window of +/-7 days, wrapping around the year boundary on a
+            # 365-day calendar. Day 366 is always Dec 31, so it is treated like
+            # day 365. Because the day of year mixes leap and non-leap years,
+            # windows can be off by one calendar day after Feb 28 in leap years.
+            # Windows are sorted so threshold probabilities reduce to a binary
+            # search (missing NaN values sort to the end)
+            windows = [grouped_values[:0]]
+            for doy in range(1, 367):
+                target = min(doy, 365)
+                window_doys = [(target - 1 + offset) % 365 + 1 for offset in range(-7, 8)]
+                if 365 in window_doys:
+                    window_doys.append(366)
+                windows.append(np.sort(np.concatenate([by_doy[d] for d in window_doys])))
+            
+            self._doy_windows[param] = windows
+    
+    def _compute_window(self, day_of_year):
+        """Historical values within +/-7 days of day_of_year, per parameter"""
+        return {param: windows[day_of_year] for param, windows in self._doy_windows.items()}
+    
+    def _reduce(self, windows):
+        """Reduce day-of-year windows to weather condition probabilities"""
+        probabilities = {}
+        
+        # Analyze each weather parameter
+        if 'temperature' in windows:
+            same_period_temp = windows['temperature']
+            
+            if len(same_period_temp) > 0:
+                # Probability of very hot (>90°F)
+                hot_prob = _exceedance_percent(same_period_temp, 90.0, True)
+                # Probability of very cold (<32°F)
+                cold_prob = _exceedance_percent(same_period_temp, 32.0, False)
+                
+                probabilities['hot'] = round(hot_prob, 1)
+                probabilities['cold'] = round(cold_prob, 1)
+        
+        # Precipitation analysis
+        if 'precipitation' in windows:
+            same_period_precip = windows['precipitation']
+            
+            if len(same_period_precip) > 0:
+                # Probability of very wet (>0.5 inches)
+                wet_prob = _exceedance_percent(same_period_precip, 0.5, True)
+                probabilities['wet'] = round(wet_prob, 1)
+        
+        # Wind analysis
+        if 'wind' in windows:
+            same_period_wind = windows['wind']
+            
+            if len(same_period_wind) > 0:
+                # Probability of very windy (>15 mph)
+                windy_prob = _exceedance_percent(same_period_wind, 15.0, True)
+                probabilities['windy'] = round(windy_prob, 1)
+        
+        # Comfort analysis (heat index precomputed from temp and humidity)
+        if 'heat_index' in windows:
+            same_period_heat_index = windows['heat_index']
+            
+            if len(same_period_heat_index) > 0:
+                # Probability of uncomfortable conditions (heat index > 85)
+                uncomfortable_prob = _exceedance_percent(same_period_heat_index, 85.0, True)
+                probabilities['uncomfortable'] = round(uncomfortable_prob, 1)
+        
+        # Ensure all expected keys are present
+        expected_keys = ['hot', 'cold', 'wet', 'windy', 'uncomfortable']
+        for key in expected_keys:
+            if key not in probabilities:
+                probabilities[key] = 0.0
         
-        self.historical_data['humidity'] = pd.DataFrame(humidity_data)
+        return probabilities
+    
+    def _build_result_cache(self):
+        """Precompute probabilities for every day of year and the historical trends"""
+        # The historical data is location-agnostic, so results only depend on
+        # the day of year (index 0 unused, 1-366 valid)
+        self._probabilities = [None] + [
+            self._reduce(self._compute_window(day_of_year)) for day_of_year in range(1, 367)
+        ]
+        self._trends = self._compute_trends()
+    
+    @staticmethod
+    def _day_of_year(target_date):
+        """Day of year for a 'YYYY-MM-DD' string or an already parsed date"""
+        if isinstance(target_date, str):
+            target_date = date.fromisoformat(target_date)
+        # Ordinal arithmetic avoids building a full struct_time per request
+        return target_date.toordinal() - date(target_date.year, 1, 1).toordinal() + 1
     
     def calculate_probabilities(self, lat, lng, target_date):
         """Calculate weather probabilities based on historical data"""
         try:
-            target_dt = datetime.strptime(target_date, '%Y-%m-%d')
-            day_of_year = target_dt.timetuple().tm_yday
-            
-            probabilities = {}
-            
-            # Analyze each weather parameter
-            if 'temperature' in self.historical_data:
-                temp_data = self.historical_data['temperature']
-                same_period_data = temp_data[
-                    (temp_data['date'].dt.dayofyear >= day_of_year - 7) & 
-                    (temp_data['date'].dt.dayofyear <= day_of_year + 7)
-                ]
-                
-                if len(same_period_data) > 0:
-                    # Probability of very hot (>90°F)
-                    hot_prob = (same_period_data['temperature'] > 90).mean() * 100
-                    # Probability of very cold (<32°F)
-                    cold_prob = (same_period_data['temperature'] < 32).mean() * 100
-                    
-                    probabilities['hot'] = round(hot_prob, 1)
-                    probabilities['cold'] = round(cold_prob, 1)
-            
-            # Precipitation analysis
-            if 'precipitation' in self.historical_data:
-                precip_data = self.historical_data['precipitation']
-                same_period_precip = precip_data[
-                    (precip_data['date'].dt.dayofyear >= day_of_year - 7) & 
-                    (precip_data['date'].dt.dayofyear <= day_of_year + 7)
-                ]
-                
-                if len(same_period_precip) > 0:
-                    # Probability of very wet (>0.5 inches)
-                    wet_prob = (same_period_precip['precipitation'] > 0.5).mean() * 100
-                    probabilities['wet'] = round(wet_prob, 1)
-            
-            # Wind analysis
-            if 'wind' in self.historical_data:
-                wind_data = self.historical_data['wind']
-                same_period_wind = wind_data[
-                    (wind_data['date'].dt.dayofyear >= day_of_year - 7) & 
-                    (wind_data['date'].dt.dayofyear <= day_of_year + 7)
-                ]
-                
-                if len(same_period_wind) > 0:
-                    # Probability of very windy (>15 mph)
-                    windy_prob = (same_period_wind['wind_speed'] > 15).mean() * 100
-                    probabilities['windy'] = round(windy_prob, 1)
-            
-            # Comfort analysis (combination of temp and humidity)
-            if ('temperature' in self.historical_data and 
-                'humidity' in self.historical_data):
-                
-                temp_data = self.historical_data['temperature']
-                humidity_data = self.historical_data['humidity']
-                
-                same_period_temp = temp_data[
-                    (temp_data['date'].dt.dayofyear >= day_of_year - 7) & 
-                    (temp_data['date'].dt.dayofyear <= day_of_year + 7)
-                ]
-                
-                same_period_humidity = humidity_data[
-                    (humidity_data['date'].dt.dayofyear >= day_of_year - 7) & 
-                    (humidity_data['date'].dt.dayofyear <= day_of_year + 7)
-                ]
-                
-                if len(same_period_temp) > 0 and len(same_period_humidity) > 0:
-                    # Merge temperature and humidity data
-                    merged_data = pd.merge(
-                        same_period_temp, same_period_humidity, on='date'
-                    )
-                    
-                    # Calculate heat index (simplified)
-                    def calculate_heat_index(temp, humidity):
-                        # Simplified heat index calculation
-                        return temp + 0.05 * (humidity - 50)
-                    
-                    merged_data['heat_index'] = merged_data.apply(
-                        lambda row: calculate_heat_index(row['temperature'], row['humidity']), 
-                        axis=1
-                    )
-                    
-                    # Probability of uncomfortable conditions (heat index > 85)
-                    uncomfortable_prob = (merged_data['heat_index'] > 85).mean() * 100
-                    probabilities['uncomfortable'] = round(uncomfortable_prob, 1)
-            
-            # Ensure all expected keys are present
-            expected_keys = ['hot', 'cold', 'wet', 'windy', 'uncomfortable']
-            for key in expected_keys:
-                if key not in probabilities:
-                    probabilities[key] = 0.0
+            day_of_year = self._day_of_year(target_date)
             
-            return probabilities
+            return dict(self._probabilities[day_of_year])
             
         except Exception as e:
             print(f"Error calculating probabilities: {e}")
@@ -367,27 +428,30 @@ class NASADataProcessor:
                 'uncomfortable': 0.0
             }
     
+    def _compute_trends(self):
+        """Historical trends from the precomputed per-day-of-year probabilities"""
+        years = list(range(2015, 2025))
+        
+        # Calculate trends for each year
+        hot_trend = []
+        wet_trend = []
+        
+        for year in years:
+            # Sample date in the middle of the year (day of year differs in leap years)
+            probs = self._probabilities[self._day_of_year(date(year, 7, 15))]
+            hot_trend.append(probs.get('hot', 0))
+            wet_trend.append(probs.get('wet', 0))
+        
+        return {
+            'years': years,
+            'hot_probabilities': hot_trend,
+            'wet_probabilities': wet_trend
+        }
+    
     def get_historical_trends(self, lat, lng):
         """Get historical trends for the location"""
         try:
-            years = list(range(2015, 2025))
-            
-            # Calculate trends for each year
-            hot_trend = []
-            wet_trend = []
-            
-            for year in years:
-                # Sample date in the middle of the year
-                sample_date = f"{year}-07-15"
-                probs = self.calculate_probabilities(lat, lng, sample_date)
-                hot_trend.append(probs.get('hot', 0))
-                wet_trend.append(probs.get('wet', 0))
-            
-            return {
-                'years': years,
-                'hot_probabilities': hot_trend,
-                'wet_probabilities': wet_trend
-            }
+            return {key: list(values) for key, values in self._trends.items()}
             
         except Exception as e:
             print(f"Error getting historical trends: {e}")
@@ -395,61 +459,71 @@ class NASADataProcessor:
             years = list(range(2015, 2025))
             return {
                 'years': years,
-                'hot_probabilities': [np.random.randint(10, 50) for _ in years],
-                'wet_probabilities': [np.random.randint(10, 40) for _ in years]
+                'hot_probabilities': self._rng.integers(10, 50, size=len(years)).tolist(),
+                'wet_probabilities': self._rng.integers(10, 40, size=len(years)).tolist()
             }
     
+    def _build_csv_section(self, probabilities, trends):
+        """Build the probability and trends rows of the CSV export"""
+        padding = [''] * len(CSV_COLUMNS)
+        rows = []
+        
+        # Main probability data
+        conditions = [
+            ('Very Hot (>90°F)', 'hot', '90°F'),
+            ('Very Cold (<32°F)', 'cold', '32°F'),
+            ('Very Wet (>0.5 in)', 'wet', '0.5 inches'),
+            ('Very Windy (>15 mph)', 'windy', '15 mph'),
+            ('Very Uncomfortable', 'uncomfortable', 'Heat Index >85')
+        ]
+        for label, key, threshold in conditions:
+            rows.append(['', '', label, probabilities.get(key, 0), threshold, '', '', ''])
+        
+        rows.append(padding)
+        
+        # Trends data
+        for year, hot, wet in zip(trends['years'], trends['hot_probabilities'], trends['wet_probabilities']):
+            rows.append(['', '', '', '', '', year, hot, wet])
+        
+        return rows
+    
+    def _build_csv_cache(self):
+        """Precompute the CSV probability/trends section for every day of year"""
+        self._csv_cache = {}
+        for day_of_year in range(1, 367):
+            self._csv_cache[day_of_year] = self._build_csv_section(
+                self._probabilities[day_of_year], self._trends
+            )
+    
     def generate_csv_data(self, lat, lng, date):
-        """Generate CSV data for download"""
+        """Generate CSV data for download as a text buffer"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
         try:
-            probabilities = self.calculate_probabilities(lat, lng, date)
-            trends = self.get_historical_trends(lat, lng)
-            
-            # Create main probability data
-            probability_data = {
-                'Weather Condition': ['Very Hot (>90°F)', 'Very Cold (<32°F)', 'Very Wet (>0.5 in)', 
-                                     'Very Windy (>15 mph)', 'Very Uncomfortable'],
-                'Probability (%)': [
-                    probabilities.get('hot', 0),
-                    probabilities.get('cold', 0),
-                    probabilities.get('wet', 0),
-                    probabilities.get('windy', 0),
-                    probabilities.get('uncomfortable', 0)
-                ],
-                'Threshold': ['90°F', '32°F', '0.5 inches', '15 mph', 'Heat Index >85']
-            }
-            
-            df_probabilities = pd.DataFrame(probability_data)
-            
-            # Create trends data
-            trends_data = {
-                'Year': trends['years'],
-                'Hot Day Probability (%)': trends['hot_probabilities'],
-                'Wet Day Probability (%)': trends['wet_probabilities']
-            }
-            
-            df_trends = pd.DataFrame(trends_data)
-            
-            # Combine both dataframes
-            combined_df = pd.concat([df_probabilities, pd.DataFrame([{'Weather Condition': ''}]), df_trends], ignore_index=True)
+            day_of_year = self._day_of_year(date)
+            section_rows = self._csv_cache[day_of_year]
             
-            # Add metadata
-            metadata = pd.DataFrame({
-                'Parameter': ['Location', 'Latitude', 'Longitude', 'Date', 'Generated On'],
-                'Value': [
-                    f"{lat:.4f}, {lng:.4f}",
-                    f"{lat:.4f}",
-                    f"{lng:.4f}",
-                    date,
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                ]
-            })
+            # Metadata rows
+            metadata = [
+                ('Location', f"{lat:.4f}, {lng:.4f}"),
+                ('Latitude', f"{lat:.4f}"),
+                ('Longitude', f"{lng:.4f}"),
+                ('Date', str(date)),
+                ('Generated On', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            ]
             
-            final_df = pd.concat([metadata, pd.DataFrame([{'Parameter': ''}]), combined_df], ignore_index=True)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows([name, value, '', '', '', '', '', ''] for name, value in metadata)
+            writer.writerow([''] * len(CSV_COLUMNS))
+            writer.writerows(section_rows)
             
-            return final_df
+            return buffer
             
         except Exception as e:
             print(f"Error generating CSV data: {e}")
-            # Return empty dataframe in case of error
-            return pd.DataFrame({'Error': ['Failed to generate data']})
\ No newline at end of file
+            # Return an error-only CSV in case of error
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            writer.writerow(['Error'])
+            writer.writerow(['Failed to generate data'])
+            return buffer
@@ -0,0 +1,5 @@
+"""WSGI entry point for production servers
+
+Run with e.g.: gunicorn -w 4 --threads 4 wsgi:app
+"""
+from app import app